@@ -9,6 +9,7 @@ from typing import List, Union
 
 from cytominer_eval.transform import metric_melt
 from cytominer_eval.utils.transform_utils import check_replicate_groups
+from cytominer_eval.utils.operation_utils import prepare_replicates
 from cytominer_eval.operations import (
     replicate_reproducibility,
     precision_recall,
@@ -35,6 +36,7 @@ def evaluate(
     mp_value_params: dict = {},
     enrichment_percentile: Union[float, List[float]] = 0.99,
     hitk_percent_list=[2, 5, 10],
+    enrichment_method: str = "fisher",
 ):
     r"""Evaluate profile quality and strength.
 
@@ -118,6 +120,10 @@ def evaluate(
         A list of percentages at which to calculate the percent scores, ie the amount of indexes below this percentage.
         If percent_list == "all" a full dict with the length of classes will be created.
         Percentages are given as integers, ie 50 means 50 %.
+    enrichment_method : {"fisher", "auto"}, optional
+        Only used when `operation='enrichment'`. How to calculate the enrichment p
+        value. See :py:func:`cytominer_eval.operations.enrichment`. Defaults to
+        "fisher".
     """
     # Check replicate groups input
     check_replicate_groups(eval_metric=operation, replicate_groups=replicate_groups)
@@ -141,17 +147,23 @@ def evaluate(
             return_median_correlations=replicate_reproducibility_return_median_cor,
         )
     elif operation == "precision_recall":
+        # assign replicates and sort once for both calls
+        prepared_df = prepare_replicates(
+            similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
+        )
         prec_rec_df, ap_df = precision_recall(
-            similarity_melted_df=similarity_melted_df,
+            similarity_melted_df=prepared_df,
             replicate_groups=replicate_groups,
             groupby_columns=groupby_columns,
             k=precision_recall_k,
+            prepared=True,
         )
         prec_R, _ = precision_recall(
-            similarity_melted_df=similarity_melted_df,
+            similarity_melted_df=prepared_df,
             replicate_groups=replicate_groups,
             groupby_columns=groupby_columns,
             k='R',
+            prepared=True,
         )
         metric_result = (prec_rec_df, prec_R, ap_df)
     elif operation == "grit":
@@ -175,6 +187,7 @@ def evaluate(
             similarity_melted_df=similarity_melted_df,
             replicate_groups=replicate_groups,
             percentile=enrichment_percentile,
+            method=enrichment_method,
         )
     elif operation == "hitk":
         metric_result = hitk(
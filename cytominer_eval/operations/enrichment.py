@@ -6,6 +6,7 @@ from typing import List, Union
 import scipy
 
 from cytominer_eval.utils.operation_utils import assign_replicates
+from cytominer_eval.utils.availability_utils import check_enrichment_method
 from cytominer_eval.utils.transform_utils import set_pair_ids, assert_melt
 
 
@@ -13,6 +14,8 @@ def enrichment(
     similarity_melted_df: pd.DataFrame,
     replicate_groups: List[str],
     percentile: Union[float, List[float]],
+    method: str = "fisher",
+    prepared: bool = False,
 ) -> pd.DataFrame:
     """Calculate the enrichment score. This score is based on the fisher exact odds score.
     Similar to the other functions, the closest connections are determined and checked with the replicates.
@@ -29,56 +32,75 @@ def enrichment(
         replicate columns.
     percentile :  List of floats
         Determines what percentage of top connections used for the enrichment calculation.
+    method : {"fisher", "auto"}, optional
+        How to calculate the p value. "fisher" always uses the fisher exact test.
+        "auto" uses a normal approximation of the log odds ratio instead when the
+        contingency table holds more than 1e5 pairs and every cell at least 10. The
+        approximation can differ by orders of magnitude for very small p values.
+        Defaults to "fisher".
+    prepared : bool, optional
+        If True, similarity_melted_df is the output of
+        :py:func:`cytominer_eval.utils.operation_utils.prepare_replicates` for the same
+        replicate_groups, and replicate assignment is skipped. Defaults to False.
 
     Returns
     -------
-    dict
+    pandas.DataFrame
         percentile, threshold, odds ratio and p value
     """
-    result = []
-    replicate_truth_df = assign_replicates(
-        similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
-    )
-    # loop over all percentiles
-    if type(percentile) == float:
-        percentile = [percentile]
-    for p in percentile:
-        # threshold based on percentile of top connections
-        threshold = similarity_melted_df.similarity_metric.quantile(p)
+    check_enrichment_method(method)
 
-        # calculate the individual components of the contingency tables
-        v11 = len(
-            replicate_truth_df.query(
-                "group_replicate==True and similarity_metric>@threshold"
-            )
-        )
-        v12 = len(
-            replicate_truth_df.query(
-                "group_replicate==False and similarity_metric>@threshold"
-            )
-        )
-        v21 = len(
-            replicate_truth_df.query(
-                "group_replicate==True and similarity_metric<=@threshold"
-            )
+    if prepared:
+        replicate_truth_df = similarity_melted_df
+    else:
+        replicate_truth_df = assign_replicates(
+            similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
         )
-        v22 = len(
-            replicate_truth_df.query(
-                "group_replicate==False and similarity_metric<=@threshold"
+    # rank all pairs by similarity once (missing similarities are sorted last)
+    sim = replicate_truth_df.similarity_metric.to_numpy()
+    order = np.argsort(sim, kind="stable")
+    sim_sorted = sim[order]
+    rep_sorted = replicate_truth_df.group_replicate.to_numpy(dtype=bool)[order]
+    # number of replicate pairs among the lowest n pairs, for every n
+    replicate_hits = np.concatenate([[0], np.cumsum(rep_sorted, dtype=np.int64)])
+    num_valid = len(sim) - np.isnan(sim).sum()
+    # accept a single (numpy) float or a list of percentiles
+    percentile = np.atleast_1d(np.asarray(percentile, dtype=float))
+    # thresholds based on percentile of top connections, computed in a single pass
+    thresholds = np.nanquantile(sim, percentile)
+    # number of pairs at or below each threshold
+    num_below = np.searchsorted(sim_sorted[:num_valid], thresholds, side="right")
+
+    # calculate the individual components of the contingency tables
+    # pairs with a missing similarity are left out of all four cells
+    v11 = replicate_hits[num_valid] - replicate_hits[num_below]
+    v12 = num_valid - num_below - v11
+    v21 = replicate_hits[num_valid] - v11
+    v22 = num_valid - v11 - v12 - v21
+    # v has to be divided by 2, as the similarity df is symmetric
+    # and hence has duplicate TP, FP, FN, TN
+    # integer halves, as the fisher exact test casts its table to integers
+    tables = np.stack([v11, v12, v21, v22], axis=-1).reshape(-1, 2, 2) // 2
+
+    odds_ratios = np.empty(len(percentile))
+    p_values = np.empty(len(percentile))
+    for i, v in enumerate(tables):
+        if method == "auto" and v.sum() > 1e5 and (v >= 10).all():
+            # the fisher exact test is costly for large tables, approximate instead
+            odds_ratios[i] = (v[0, 0] * v[1, 1]) / (v[0, 1] * v[1, 0])
+            standard_error = np.sqrt((1 / v).sum())
+            p_values[i] = scipy.stats.norm.sf(np.log(odds_ratios[i]) / standard_error)
+        else:
+            odds_ratios[i], p_values[i] = scipy.stats.fisher_exact(
+                v, alternative="greater"
             )
-        )
 
-        v = np.asarray([[v11, v12], [v21, v22]])
-        # v has to be divided by 2, as the similarity df is symmetric
-        # and hence has duplicate TP, FP, FN, TN
-        r = scipy.stats.fisher_exact(v/2, alternative="greater")
-        result.append(
-            {
-                "enrichment_percentile": p,
-                "threshold": threshold,
-                "ods_ratio": r[0],
-                "p-value": r[1],
-            }
-        )
-    result_df = pd.DataFrame(result)
+    result_df = pd.DataFrame(
+        {
+            "enrichment_percentile": percentile,
+            "threshold": thresholds,
+            "ods_ratio": odds_ratios,
+            "p-value": p_values,
+        }
+    )
     return result_df
@@ -7,8 +7,12 @@ import pandas as pd
 from sklearn.metrics import average_precision_score
 from typing import List, Union
 
-from cytominer_eval.utils.precisionrecall_utils import calculate_precision_recall, calculate_average_precision
-from cytominer_eval.utils.operation_utils import assign_replicates
+from cytominer_eval.utils.precisionrecall_utils import (
+    average_precision_per_group,
+    count_above_thresholds,
+    precision_recall_at_ks,
+)
+from cytominer_eval.utils.operation_utils import prepare_replicates
 from cytominer_eval.utils.transform_utils import set_pair_ids, assert_melt
 
 
@@ -17,6 +21,7 @@ def precision_recall(
     replicate_groups: List[str],
     groupby_columns: List[str],
     k: Union[int, List[int], str],
+    prepared: bool = False,
 ) -> pd.DataFrame:
     """Determine the precision and recall at k for all unique groupby_columns samples
     based on a predefined similarity metric (see cytominer_eval.transform.metric_melt)
@@ -37,6 +42,11 @@ def precision_recall(
     k : List of ints or int
         an integer indicating how many pairwise comparisons to threshold.
         if k = 'R' then precision at R will be calculated where R is the number of other replicates
+    prepared : bool, optional
+        If True, similarity_melted_df is the output of
+        :py:func:`cytominer_eval.utils.operation_utils.prepare_replicates` for the same
+        replicate_groups, and replicate assignment and sorting are skipped.
+        Defaults to False.
     Returns
     -------
     pandas.DataFrame
@@ -45,9 +55,10 @@ def precision_recall(
     # Check for correct k input
     assert Union[int, List[int], str]
     # Determine pairwise replicates and make sure to sort based on the metric!
-    similarity_melted_df = assign_replicates(
-        similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
-    ).sort_values(by="similarity_metric", ascending=False)
+    if not prepared:
+        similarity_melted_df = prepare_replicates(
+            similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
+        )
 
     # Check to make sure that the melted dataframe is full
     assert_melt(similarity_melted_df, eval_metric="precision_recall")
@@ -58,25 +69,92 @@ def precision_recall(
         "{x}{suf}".format(x=x, suf=pair_ids[list(pair_ids)[0]]["suffix"])
         for x in groupby_columns
     ]
-    # iterate over all k
-    precision_recall_df = pd.DataFrame()
-    if type(k) == int:
-        k = [k]
-    for k_ in k:
-        # Calculate precision and recall for all groups
-        precision_recall_df_at_k = similarity_melted_df.groupby(
-            groupby_cols_suffix
-        ).apply(lambda x: calculate_precision_recall(x, k=k_))
-        precision_recall_df = pd.concat([precision_recall_df, precision_recall_df_at_k])
+    # Combine the factorized groupby columns into a single integer key per row
+    # rows with a missing group value get group code -1
+    group_key = np.zeros(similarity_melted_df.shape[0], dtype=np.int64)
+    is_missing = np.zeros(similarity_melted_df.shape[0], dtype=bool)
+    for col in groupby_cols_suffix:
+        col_codes, col_uniques = pd.factorize(similarity_melted_df[col], sort=True)
+        group_key = group_key * len(col_uniques) + col_codes
+        is_missing |= col_codes < 0
+    group_codes = np.full(similarity_melted_df.shape[0], -1, dtype=np.int64)
+    group_codes[~is_missing], group_uniques = pd.factorize(
+        group_key[~is_missing], sort=True
+    )
+
+    # Order rows by group while keeping them ranked by similarity within each group
+    # the sorted group codes set the order of groups in all outputs
+    order = np.argsort(group_codes, kind="stable")
+    # rows with a missing group value sort first; drop them like pandas.groupby
+    order = order[np.count_nonzero(is_missing) :]
+    group_start = np.searchsorted(group_codes[order], np.arange(len(group_uniques)))
+    group_end = np.append(group_start[1:], len(order))
+    # replicate flags in group order, as bool and as a zero-copy uint8 view
+    is_replicate = similarity_melted_df.group_replicate.to_numpy(dtype=bool)[order]
+    rel = is_replicate.view(np.uint8)
+    group_df = similarity_melted_df.iloc[order[group_start]].loc[
+        :, groupby_cols_suffix
+    ].reset_index(drop=True)
+    total_relevant = np.add.reduceat(rel, group_start, dtype=np.int64)
+
+    # Calculate precision and recall for all groups and all k
+    if isinstance(k, str) and k == "R":
+        precision, _ = precision_recall_at_ks(
+            rel, group_start, group_end, total_relevant[:, np.newaxis]
+        )
+        precision_recall_df = group_df.assign(
+            R=total_relevant.astype(float), precision=precision[:, 0]
+        )
+    else:
+        # accept a single (numpy) integer or a list of integers
+        k = np.atleast_1d(np.asarray(k, dtype=np.int64))
+        precision, recall = precision_recall_at_ks(rel, group_start, group_end, k)
+        # long format: all groups at the first k, then all groups at the next k
+        precision_recall_df = group_df.loc[np.tile(group_df.index, len(k))]
+        precision_recall_df = precision_recall_df.reset_index(drop=True).assign(
+            k=np.repeat(k, len(group_df)).astype(float),
+            precision=precision.ravel(order="F"),
+            recall=recall.ravel(order="F"),
+        )
 
     # Rename the columns back to the replicate groups provided
     rename_cols = dict(zip(groupby_cols_suffix, groupby_columns))
-    prec_rec_df = precision_recall_df.reset_index().rename(rename_cols, axis="columns")
+    prec_rec_df = precision_recall_df.rename(rename_cols, axis="columns")
+
     # calculate mean average precision (mAP) based on correlation values
-    ap_df = similarity_melted_df.groupby(
-            groupby_cols_suffix
-        ).apply(lambda x: calculate_average_precision(x)).reset_index()
-    ap_df = ap_df.rename(rename_cols, axis="columns").drop(columns=['level_1'])
+    # negative correlations are scored as 0 and tie with each other
+    # reordering already copied the similarities, so clip that copy in place
+    similarity_clipped = similarity_melted_df.similarity_metric.to_numpy()[order]
+    np.maximum(similarity_clipped, 0, out=similarity_clipped)
+    ap, ap_over_k = average_precision_per_group(
+        rel, similarity_clipped, group_start, group_end
+    )
+
+    # precision and recall over a grid of correlation thresholds
+    thresholds = np.linspace(0, 1, 30)
+    # rows are ranked within each group, so the rows above a threshold are a prefix
+    above_end = count_above_thresholds(
+        similarity_clipped, group_start, group_end, thresholds
+    )
+    hits = np.concatenate([[0], np.cumsum(rel, dtype=np.int64)])
+    num_predicted = above_end - group_start[:, np.newaxis]
+    num_hits = hits[above_end] - hits[group_start][:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(num_predicted > 0, num_hits / num_predicted, 0)
+        recall = np.where(
+            total_relevant[:, np.newaxis] > 0,
+            num_hits / total_relevant[:, np.newaxis],
+            0,
+        )
+
+    ap_df = group_df.loc[group_df.index.repeat(len(thresholds))].reset_index(drop=True)
+    ap_df = ap_df.assign(
+        precision=precision.ravel(),
+        recall=recall.ravel(),
+        correlation=np.tile(thresholds, len(group_df)),
+        AP=np.repeat(ap, len(thresholds)),
+        AP_over_k=np.repeat(ap_over_k, len(thresholds)),
+    ).rename(rename_cols, axis="columns")
     # compute micro average precision over correlation
     # TODO do we need to do this only for unique pairs?
     # yscore = similarity_melted_df.similarity_metric.values
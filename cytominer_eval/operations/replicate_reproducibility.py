@@ -56,16 +56,17 @@ def replicate_reproducibility(
     assert_melt(similarity_melted_df, eval_metric="replicate_reproducibility")
 
     # check that there are group_replicates (non-unique rows)
-    replicate_df = similarity_melted_df.query("group_replicate")
+    is_replicate = similarity_melted_df.group_replicate.to_numpy(dtype=bool)
+    replicate_df = similarity_melted_df.loc[is_replicate]
     denom = replicate_df.shape[0]
 
     assert denom != 0, "no replicate groups identified in {rep} columns!".format(
         rep=replicate_groups
     )
 
-    non_replicate_quantile = similarity_melted_df.query(
-        "not group_replicate"
-    ).similarity_metric.quantile(quantile_over_null)
+    non_replicate_quantile = similarity_melted_df.similarity_metric.loc[
+        ~is_replicate
+    ].quantile(quantile_over_null)
 
     replicate_reproducibility = (
         replicate_df.similarity_metric > non_replicate_quantile
@@ -138,7 +138,7 @@ def test_evaluate_precision_recall():
     for k in ks:
 
         # first test the function with k = float, later we test with k = list of floats
-        result = evaluate(
+        result, _, _ = evaluate(
             profiles=gene_profiles,
             features=gene_features,
             meta_features=gene_meta_features,
@@ -158,7 +158,7 @@ def test_evaluate_precision_recall():
             == expected_result["gene"]["recall"][str(k)]
         )
         # test function with argument k = list of floats, should give same result as above
-        result = evaluate(
+        result, _, _ = evaluate(
             profiles=compound_profiles,
             features=compound_features,
             meta_features=compound_meta_features,
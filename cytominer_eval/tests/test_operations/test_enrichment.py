@@ -5,9 +5,11 @@ import pathlib
 import tempfile
 import numpy as np
 import pandas as pd
+import scipy.stats
 
 from cytominer_eval.transform import metric_melt
 from cytominer_eval.operations.enrichment import enrichment
+from cytominer_eval.utils.operation_utils import assign_replicates, prepare_replicates
 from cytominer_eval import evaluate
 
 
@@ -64,6 +66,14 @@ def test_enrichment():
 
     assert result_int.enrichment_percentile[0] == result.enrichment_percentile.iloc[-1]
 
+    result_np = enrichment(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        percentile=np.float64(0.97),
+    )
+
+    assert result_np.equals(result_int)
+
 
 def test_compare_functions():
     percent_list = [0.95, 0.9]
@@ -82,3 +92,130 @@ def test_compare_functions():
         percentile=percent_list,
     )
     assert enr_res.equals(eval_res)
+
+
+def test_enrichment_method():
+    percent_list = [0.99, 0.95]
+    result = enrichment(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+    )
+
+    # the example data is small enough for "auto" to use the exact test
+    result_auto = enrichment(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+        method="auto",
+    )
+    assert result_auto.equals(result)
+
+    with pytest.raises(AssertionError) as ae:
+        output = enrichment(
+            similarity_melted_df=similarity_melted_df,
+            replicate_groups=replicate_groups,
+            percentile=percent_list,
+            method="MISSING",
+        )
+    assert "MISSING not supported. Available enrichment methods:" in str(ae.value)
+
+
+def test_enrichment_prepared():
+    percent_list = [0.99, 0.95]
+    result = enrichment(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+    )
+
+    prepared_df = prepare_replicates(
+        similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
+    )
+    result_prepared = enrichment(
+        similarity_melted_df=prepared_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+        prepared=True,
+    )
+
+    assert result_prepared.equals(result)
+
+
+def test_enrichment_missing_similarity():
+    percent_list = [0.99, 0.5]
+    missing_df = similarity_melted_df.copy()
+    missing_df.loc[missing_df.index[::5], "similarity_metric"] = np.nan
+
+    result = enrichment(
+        similarity_melted_df=missing_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+    )
+
+    # pairs with a missing similarity are neither above nor below the threshold
+    replicate_truth_df = assign_replicates(
+        similarity_melted_df=missing_df, replicate_groups=replicate_groups
+    )
+    sim = replicate_truth_df.similarity_metric
+    rep = replicate_truth_df.group_replicate
+    for i, p in enumerate(percent_list):
+        threshold = sim.quantile(p)
+        v = np.asarray(
+            [
+                [(rep & (sim > threshold)).sum(), (~rep & (sim > threshold)).sum()],
+                [(rep & (sim <= threshold)).sum(), (~rep & (sim <= threshold)).sum()],
+            ]
+        )
+        expected = scipy.stats.fisher_exact(v / 2, alternative="greater")
+        assert np.isclose(result.threshold[i], threshold)
+        assert np.isclose(result.ods_ratio[i], expected[0])
+        assert np.isclose(result["p-value"][i], expected[1])
+
+
+def test_enrichment_normal_approximation():
+    # a prepared frame with more than 1e5 (halved) pairs
+    rng = np.random.default_rng(42)
+    sim = rng.uniform(-1, 1, size=300001)
+    synthetic_df = pd.DataFrame(
+        {
+            "similarity_metric": sim,
+            "group_replicate": rng.uniform(size=sim.shape[0]) < (sim + 1) / 20,
+        }
+    )
+    percent_list = [0.99, 0.9]
+
+    result_fisher = enrichment(
+        similarity_melted_df=synthetic_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+        prepared=True,
+    )
+    result_auto = enrichment(
+        similarity_melted_df=synthetic_df,
+        replicate_groups=replicate_groups,
+        percentile=percent_list,
+        method="auto",
+        prepared=True,
+    )
+
+    rep = synthetic_df.group_replicate.to_numpy()
+    for i, p in enumerate(percent_list):
+        above = sim > np.quantile(sim, p)
+        v = np.asarray(
+            [
+                [(rep & above).sum(), (~rep & above).sum()],
+                [(rep & ~above).sum(), (~rep & ~above).sum()],
+            ]
+        )
+        v = v // 2
+        log_odds_ratio = np.log((v[0, 0] * v[1, 1]) / (v[0, 1] * v[1, 0]))
+        standard_error = np.sqrt((1 / v).sum())
+        expected_p_value = scipy.stats.norm.sf(log_odds_ratio / standard_error)
+        expected_fisher = scipy.stats.fisher_exact(v, alternative="greater")
+
+        assert np.isclose(result_auto["p-value"][i], expected_p_value)
+        assert result_fisher.ods_ratio[i] == expected_fisher[0]
+        assert result_fisher["p-value"][i] == expected_fisher[1]
+        # both methods report the same odds ratio
+        assert result_auto.ods_ratio[i] == result_fisher.ods_ratio[i]
@@ -1,11 +1,17 @@
 import os
 import random
 import pathlib
+import numpy as np
 import pandas as pd
 
 
 from cytominer_eval.transform import metric_melt
 from cytominer_eval.operations import precision_recall
+from cytominer_eval.utils.operation_utils import prepare_replicates
+from cytominer_eval.utils.precisionrecall_utils import (
+    calculate_average_precision,
+    calculate_precision_recall,
+)
 
 random.seed(42)
 
@@ -38,14 +44,14 @@ groupby_columns = ["Metadata_pert_name"]
 
 
 def test_precision_recall():
-    result_list = precision_recall(
+    result_list, _ = precision_recall(
         similarity_melted_df=similarity_melted_df,
         replicate_groups=replicate_groups,
         groupby_columns=groupby_columns,
         k=[5, 10],
     )
 
-    result_int = precision_recall(
+    result_int, _ = precision_recall(
         similarity_melted_df=similarity_melted_df,
         replicate_groups=replicate_groups,
         groupby_columns=groupby_columns,
@@ -67,3 +73,78 @@ def test_precision_recall():
     assert all(x in result_list.columns for x in groupby_columns)
 
     assert result_int.equals(result_list.query("k == 5"))
+
+    # k and R are reported as floats
+    result_R, _ = precision_recall(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k="R",
+    )
+    assert result_list.k.dtype == "float64"
+    assert result_R.R.dtype == "float64"
+
+    # k is cast to integers at entry
+    result_float, _ = precision_recall(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k=[5.0],
+    )
+    assert result_float.equals(result_int)
+
+    result_empty, _ = precision_recall(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k=[],
+    )
+    assert result_empty.shape[0] == 0
+
+
+def test_precision_recall_prepared():
+    result, ap_result = precision_recall(
+        similarity_melted_df=similarity_melted_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k=[5, 10],
+    )
+
+    prepared_df = prepare_replicates(
+        similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
+    )
+    result_prepared, ap_result_prepared = precision_recall(
+        similarity_melted_df=prepared_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k=[5, 10],
+        prepared=True,
+    )
+
+    assert result_prepared.equals(result)
+    assert ap_result_prepared.equals(ap_result)
+
+
+def test_precision_recall_missing_groupby_values():
+    missing_df = similarity_melted_df.copy()
+    missing_df.loc[missing_df.index[:500], "Metadata_pert_name_pair_a"] = None
+
+    result, ap_result = precision_recall(
+        similarity_melted_df=missing_df,
+        replicate_groups=replicate_groups,
+        groupby_columns=groupby_columns,
+        k=5,
+    )
+
+    # the same as the per-group calculation, which pandas.groupby skips
+    grouped = prepare_replicates(
+        similarity_melted_df=missing_df, replicate_groups=replicate_groups
+    ).groupby("Metadata_pert_name_pair_a")
+    expected_result = grouped.apply(lambda x: calculate_precision_recall(x, k=5))
+    expected_ap_result = grouped.apply(calculate_average_precision)
+
+    assert result.Metadata_pert_name.tolist() == expected_result.index.tolist()
+    assert np.allclose(result.precision, expected_result.precision)
+    assert np.allclose(result.recall, expected_result.recall)
+    assert np.allclose(ap_result.AP, expected_ap_result.AP)
+    assert np.allclose(ap_result.AP_over_k, expected_ap_result.AP_over_k)
@@ -12,10 +12,12 @@ from cytominer_eval.utils.availability_utils import (
     get_available_similarity_metrics,
     get_available_summary_methods,
     get_available_distribution_compare_methods,
+    get_available_enrichment_methods,
     check_eval_metric,
     check_replicate_summary_method,
     check_similarity_metric,
     check_compare_distribution_method,
+    check_enrichment_method,
 )
 
 
@@ -46,6 +48,11 @@ def test_get_available_distribution_compare_methods():
     assert expected_result == get_available_distribution_compare_methods()
 
 
+def test_get_available_enrichment_methods():
+    expected_result = ["fisher", "auto"]
+    assert expected_result == get_available_enrichment_methods()
+
+
 def test_check_eval_metric():
     with pytest.raises(AssertionError) as ae:
         output = check_eval_metric(eval_metric="MISSING")
@@ -77,3 +84,12 @@ def test_check_compare_distribution_method():
     with pytest.raises(AssertionError) as ve:
         output = check_compare_distribution_method("fail")
     assert "not supported. Available distribution methods:" in str(ve.value)
+
+
+def test_check_enrichment_method():
+    for metric in get_available_enrichment_methods():
+        check_enrichment_method(metric)
+
+    with pytest.raises(AssertionError) as ve:
+        output = check_enrichment_method("fail")
+    assert "fail not supported. Available enrichment methods:" in str(ve.value)
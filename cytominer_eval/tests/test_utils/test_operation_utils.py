@@ -6,11 +6,18 @@ import tempfile
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
+from sklearn.metrics import average_precision_score
 
 from cytominer_eval.operations import grit
 from cytominer_eval.transform import metric_melt
 from cytominer_eval.utils.transform_utils import set_pair_ids
-from cytominer_eval.utils.precisionrecall_utils import calculate_precision_recall
+from cytominer_eval.utils.precisionrecall_utils import (
+    average_precision_per_group,
+    calculate_average_precision,
+    calculate_precision_recall,
+    count_above_thresholds,
+    precision_recall_at_ks,
+)
 from cytominer_eval.utils.availability_utils import get_available_summary_methods
 from cytominer_eval.utils.operation_utils import (
     assign_replicates,
@@ -149,6 +156,83 @@ def test_calculate_precision_recall():
     assert result.loc["recall", "result"] == 1
 
 
+def test_precision_recall_at_ks():
+    rel = np.array([1, 0, 1, 0, 0, 1, 1], dtype=np.uint8)
+    group_start = np.array([0, 4])
+    group_end = np.array([4, 7])
+
+    precision, recall = precision_recall_at_ks(
+        rel, group_start, group_end, np.array([1, 2, 10])
+    )
+
+    expected_precision = np.array([[1, 0.5, 0.2], [0, 0.5, 0.2]])
+    expected_recall = np.array([[0.5, 0.5, 1], [0, 0.5, 1]])
+    assert np.allclose(precision, expected_precision)
+    assert np.allclose(recall, expected_recall)
+
+    # A different k per group, e.g. precision at R
+    precision, _ = precision_recall_at_ks(
+        rel, group_start, group_end, np.array([[2], [2]])
+    )
+    assert np.allclose(precision[:, 0], [0.5, 0.5])
+
+
+def test_count_above_thresholds():
+    score = np.array([0.9, 0.5, 0.5, 0, 0.8, 0.2, np.nan])
+    group_start = np.array([0, 4])
+    group_end = np.array([4, 7])
+    thresholds = np.array([0, 0.5, 0.85, 1])
+
+    result = count_above_thresholds(score, group_start, group_end, thresholds)
+
+    expected = np.array([[3, 1, 1, 0], [2, 1, 0, 0]]) + group_start[:, np.newaxis]
+    assert np.array_equal(result, expected)
+
+
+def test_calculate_average_precision():
+    replicate_group_df = pd.DataFrame(
+        {
+            "similarity_metric": [0.9, 0.4, -0.1, -0.3, -0.5],
+            "group_replicate": [True, False, False, True, False],
+        }
+    )
+
+    result = calculate_average_precision(replicate_group_df.copy())
+
+    # negative similarities tie at 0
+    expected_ap = average_precision_score(
+        [True, False, False, True, False], [0.9, 0.4, 0, 0, 0]
+    )
+    assert np.isclose(result.AP[0], expected_ap)
+    assert np.isclose(result.AP_over_k[0], (1 + 2 / 4) / 2)
+    assert result.shape == (30, 5)
+
+    # the input dataframe is not modified
+    calculate_average_precision(replicate_group_df)
+    assert replicate_group_df.similarity_metric.min() == -0.5
+
+
+def test_average_precision_per_group():
+    rel = np.array([1, 0, 1, 0, 0, 1, 1, 0, 0, 0], dtype=np.uint8)
+    score = np.array([0.9, 0.5, 0.5, 0.1, 0.8, 0.3, 0.3, 0.3, 0.2, 0.1])
+    group_start = np.array([0, 4, 8])
+    group_end = np.array([4, 8, 10])
+
+    ap, ap_over_k = average_precision_per_group(rel, score, group_start, group_end)
+
+    for i, (start, end) in enumerate(zip(group_start, group_end)):
+        if rel[start:end].sum() == 0:
+            assert ap[i] == 0 and ap_over_k[i] == 0
+            continue
+        assert np.isclose(
+            ap[i], average_precision_score(rel[start:end], score[start:end])
+        )
+        assert np.isclose(
+            ap_over_k[i],
+            average_precision_score(rel[start:end], -np.arange(end - start)),
+        )
+
+
 def test_compare_distributions():
     # Define two distributions using a specific compound as an example
     compound = "BRD-K07857022-002-01-1"
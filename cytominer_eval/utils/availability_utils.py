@@ -25,6 +25,11 @@ def get_available_distribution_compare_methods():
     return ["zscore"]
 
 
+def get_available_enrichment_methods():
+    """Output the available methods to calculate the enrichment p value"""
+    return ["fisher", "auto"]
+
+
 def check_eval_metric(eval_metric: str) -> None:
     """Helper function to ensure that we support the input eval metric
 
@@ -113,3 +118,25 @@ def check_compare_distribution_method(distribution_method: str) -> None:
     ), "{m} not supported. Available distribution methods: {avail}".format(
         m=distribution_method, avail=avail_methods
     )
+
+
+def check_enrichment_method(enrichment_method: str) -> None:
+    """Helper function to ensure that we support the user input enrichment method
+
+    Parameters
+    ----------
+    enrichment_method : str
+        The user input enrichment method
+
+    Returns
+    -------
+    None
+        Assertion will fail if the user inputs an incorrect enrichment method
+    """
+    avail_methods = get_available_enrichment_methods()
+
+    assert (
+        enrichment_method in avail_methods
+    ), "{m} not supported. Available enrichment methods: {avail}".format(
+        m=enrichment_method, avail=avail_methods
+    )
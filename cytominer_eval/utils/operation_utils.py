@@ -74,6 +74,36 @@ def assign_replicates(
     return similarity_melted_df
 
 
+def prepare_replicates(
+    similarity_melted_df: pd.DataFrame,
+    replicate_groups: List[str],
+) -> pd.DataFrame:
+    """Assign replicates and rank all pairwise comparisons by similarity.
+
+    Use this function to share the replicate assignment and the sort between
+    operations run on the same data. Pass the output to
+    :py:func:`cytominer_eval.operations.enrichment` or
+    :py:func:`cytominer_eval.operations.precision_recall` with `prepared=True`.
+
+    Parameters
+    ----------
+    similarity_melted_df : pandas.DataFrame
+        Long pandas DataFrame of annotated pairwise correlations output from
+        :py:func:`cytominer_eval.transform.transform.metric_melt`.
+    replicate_groups : list
+        a list of metadata column names in the original profile dataframe used to
+        indicate replicate profiles.
+
+    Returns
+    -------
+    pd.DataFrame
+        The output of :py:func:`assign_replicates`, sorted by descending similarity.
+    """
+    return assign_replicates(
+        similarity_melted_df=similarity_melted_df, replicate_groups=replicate_groups
+    ).sort_values(by="similarity_metric", ascending=False)
+
+
 def compare_distributions(
     target_distrib: List[float],
     control_distrib: List[float],
@@ -1,18 +1,25 @@
 import pandas as pd
 import numpy as np
 from sklearn.metrics import average_precision_score
-from sklearn.metrics import precision_score, recall_score
 
 def calculate_average_precision(replicate_group_df: pd.DataFrame):
     # compute average precision using similarity as a prediction score
     # AP is computed for each drug and the ground truth values are
     # binary with True, if the drug is in the same class
-    yscore = replicate_group_df.similarity_metric.values
-    yscore[yscore < 0] = 0
-    ytrue = replicate_group_df.group_replicate.values
+    # negative similarities are scored as 0, without writing to the input dataframe
+    yscore = replicate_group_df.similarity_metric.to_numpy()
+    if (yscore < 0).any():
+        yscore = np.maximum(yscore, 0)
+    ytrue = replicate_group_df.group_replicate.to_numpy(dtype=bool)
     thresholds = np.linspace(0,1,30)
-    precision = [precision_score(ytrue, yscore > t, zero_division=0) for t in thresholds]
-    recall = [recall_score(ytrue, yscore > t, zero_division=0) for t in thresholds]
+    # precision and recall at every threshold, with 0 where undefined
+    predicted = yscore[:, np.newaxis] > thresholds
+    num_hits = (predicted & ytrue[:, np.newaxis]).sum(axis=0)
+    num_predicted = predicted.sum(axis=0)
+    num_relevant = ytrue.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(num_predicted > 0, num_hits / num_predicted, 0)
+        recall = np.where(num_relevant > 0, num_hits / num_relevant, 0)
     #precision, recall, thresholds = precision_recall_curve(ytrue, yscore)
     pr_curve = pd.DataFrame(dict(precision=precision, recall=recall,
                                  correlation=thresholds))
@@ -47,16 +54,13 @@ def calculate_precision_recall(replicate_group_df: pd.DataFrame, k) -> pd.Series
         "group_replicate" in replicate_group_df.columns
     ), "'group_replicate' not found in dataframe; remember to call assign_replicates()."
 
-    recall_denom__total_relevant_items = sum(replicate_group_df.group_replicate)
+    group_replicate = replicate_group_df.group_replicate.to_numpy()
+    recall_denom__total_relevant_items = group_replicate.sum()
 
     if k != "R":
         precision_denom__num_recommended_items = k
 
-        num_recommended_items_at_k = sum(
-            replicate_group_df.iloc[
-                :k,
-            ].group_replicate
-        )
+        num_recommended_items_at_k = group_replicate[:k].sum()
 
         precision_at_k = num_recommended_items_at_k / precision_denom__num_recommended_items
         recall_at_k = num_recommended_items_at_k / recall_denom__total_relevant_items     
@@ -66,14 +70,139 @@ def calculate_precision_recall(replicate_group_df: pd.DataFrame, k) -> pd.Series
     else:
         R = recall_denom__total_relevant_items
 
-        num_recommended_items_at_k = sum(
-            replicate_group_df.iloc[
-            :R,
-            ].group_replicate
-        )
+        num_recommended_items_at_k = group_replicate[:R].sum()
 
         precision_at_k = num_recommended_items_at_k / R
 
         return_bundle = {"R": R, "precision": precision_at_k}
 
         return pd.Series(return_bundle)
+
+
+def precision_recall_at_ks(
+    rel: np.ndarray, group_start: np.ndarray, group_end: np.ndarray, ks: np.ndarray
+):
+    """Calculate precision and recall at k for many groups and many k at once.
+
+    Parameters
+    ----------
+    rel : numpy.ndarray
+        A flat array indicating whether each pairwise comparison is a replicate.
+        Rows must be contiguous by group and ranked by similarity within each group.
+    group_start : numpy.ndarray
+        The position of the first row of each group in `rel`.
+    group_end : numpy.ndarray
+        The position one past the last row of each group in `rel`.
+    ks : numpy.ndarray
+        The k values to threshold, either of shape (n_ks,) or of shape
+        (n_groups, n_ks) to use a different k per group (e.g. k = R).
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Precision and recall at k, each of shape (n_groups, n_ks).
+    """
+    hits = np.concatenate([[0], np.cumsum(rel, dtype=np.int64)])
+    group_start = group_start[:, np.newaxis]
+    group_end = group_end[:, np.newaxis]
+
+    total_relevant = hits[group_end] - hits[group_start]
+    num_recommended_items_at_k = (
+        hits[np.minimum(group_start + ks, group_end)] - hits[group_start]
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision_at_k = num_recommended_items_at_k / ks
+        recall_at_k = num_recommended_items_at_k / total_relevant
+    return precision_at_k, recall_at_k
+
+
+def average_precision_per_group(
+    rel: np.ndarray,
+    score: np.ndarray,
+    group_start: np.ndarray,
+    group_end: np.ndarray,
+):
+    """Calculate average precision for many groups at once.
+
+    Parameters
+    ----------
+    rel : numpy.ndarray
+        A flat array indicating whether each pairwise comparison is a replicate.
+        Rows must be contiguous by group and ranked by score within each group.
+    score : numpy.ndarray
+        The score used to rank each pairwise comparison. Rows with tied scores share
+        the precision at the end of their tied block.
+    group_start : numpy.ndarray
+        The position of the first row of each group in `rel`.
+    group_end : numpy.ndarray
+        The position one past the last row of each group in `rel`.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Average precision over the score and over the rank (k) of each group. Groups
+        without replicates have an average precision of 0.
+    """
+    group_size = group_end - group_start
+    row_group_start = np.repeat(group_start, group_size)
+
+    hits = np.concatenate([[0], np.cumsum(rel, dtype=np.int64)])
+    total_relevant = hits[group_end] - hits[group_start]
+    true_positives = hits[1:] - hits[row_group_start]
+    rank_precision = true_positives / (np.arange(len(rel)) - row_group_start + 1)
+
+    # the last row of every block of tied scores within a group
+    is_block_end = np.ones(len(rel), dtype=bool)
+    is_block_end[:-1] = score[:-1] != score[1:]
+    is_block_end[group_end - 1] = True
+    # each row takes the precision at the end of its block
+    block_id = np.concatenate([[0], np.cumsum(is_block_end[:-1])])
+    block_precision = rank_precision[is_block_end][block_id]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ap = np.add.reduceat(rel * block_precision, group_start) / total_relevant
+        ap_over_k = np.add.reduceat(rel * rank_precision, group_start) / total_relevant
+    has_relevant = total_relevant > 0
+    return np.where(has_relevant, ap, 0), np.where(has_relevant, ap_over_k, 0)
+
+
+def count_above_thresholds(
+    score: np.ndarray,
+    group_start: np.ndarray,
+    group_end: np.ndarray,
+    thresholds: np.ndarray,
+):
+    """Find, for every group and threshold, how many rows score above the threshold.
+
+    Parameters
+    ----------
+    score : numpy.ndarray
+        A flat array of scores. Rows must be contiguous by group and ranked by
+        descending score within each group.
+    group_start : numpy.ndarray
+        The position of the first row of each group in `score`.
+    group_end : numpy.ndarray
+        The position one past the last row of each group in `score`.
+    thresholds : numpy.ndarray
+        The thresholds to compare against, of shape (n_thresholds,).
+
+    Returns
+    -------
+    numpy.ndarray
+        The position one past the last row above each threshold, of shape
+        (n_groups, n_thresholds). Subtract `group_start` to get the counts.
+    """
+    # binary search within each group, for all groups and thresholds at once
+    lo = np.repeat(group_start[:, np.newaxis], len(thresholds), axis=1)
+    hi = np.repeat(group_end[:, np.newaxis], len(thresholds), axis=1)
+    while (lo < hi).any():
+        searching = lo < hi
+        mid = (lo + hi) // 2
+        is_above = np.zeros(lo.shape, dtype=bool)
+        is_above[searching] = score[mid[searching]] > thresholds[
+            np.nonzero(searching)[1]
+        ]
+        lo = np.where(searching & is_above, mid + 1, lo)
+        hi = np.where(searching & ~is_above, mid, hi)
+    return lo